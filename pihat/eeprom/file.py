@@ -18,7 +18,8 @@ __all__ = [
 class OpenableFile:
     """Openable file base class"""
 
-    file: Union[None, PathLike, IO] = field(default=None, compare=False)
+    file: Union[None, PathLike, IO, bytes, bytearray,
+                memoryview] = field(default=None, compare=False)
     mode: str = field(default='r+b', compare=False)
 
     _ctx: List = field(init=False, repr=False, compare=False,
@@ -78,14 +79,20 @@ class EepromFile(Eeprom, OpenableFile):
             self.uuid = uuid
 
     def load(self, file=None, mode='rb'):
-        """Load EEPROM from file"""
+        """Load EEPROM from file or in-memory buffer"""
+        if file is None:
+            file = self.file
+        if isinstance(file, memoryview):
+            file = bytes(file)
+        if isinstance(file, (bytes, bytearray)):
+            return self.unpack(file)
         with self.open(file, mode) as fh:
             with suppress(IOError):
                 fh.seek(0)
             return self.unpack(fh.read())
 
     def save(self, file=None, mode='wb', verify=False):
-        """Save EEPROM to file"""
+        """Save EEPROM to file, returning the serialized data"""
         data = self.pack()
         with self.open(file, mode) as fh:
             with suppress(IOError):
@@ -97,3 +104,4 @@ class EepromFile(Eeprom, OpenableFile):
                 check = fh.read(len(data))
             if check != data:
                 raise EepromVerificationError("Verification failed")
+        return data
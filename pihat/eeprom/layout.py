@@ -319,24 +319,46 @@ class EepromGpioMap(EepromAtomData, EepromLittleEndianStructure):
 
 @dataclass
 class EepromDeviceTreeBlob(EepromAtomData):
-    """EEPROM device tree blob"""
+    """EEPROM device tree blob
+
+    The device tree is parsed lazily: unpacking retains the raw blob
+    and defers the FDT parse until the `fdt` attribute is first
+    accessed, since most consumers never inspect the device tree.
+    """
 
     type: ClassVar[EepromAtomType] = EepromAtomType.DTBO
 
-    fdt: FDT = field(default_factory=FDT)
+    _fdt: Optional[FDT] = field(default=None, repr=False, init=False)
+    _raw: Optional[bytes] = field(default=None, repr=False, init=False)
+
+    @property
+    def fdt(self):
+        """Flattened device tree"""
+        if self._fdt is None:
+            self._fdt = (parse_dtb(self._raw) if self._raw is not None
+                         else FDT())
+        return self._fdt
+
+    @fdt.setter
+    def fdt(self, value):
+        self._fdt = value
+        self._raw = None
 
     def __len__(self):
         return len(self.pack(fixup=True))
 
     def pack(self, fixup=True):
         super().pack(fixup=fixup)
+        if self._fdt is None and self._raw is not None:
+            return self._raw
         if fixup and self.fdt.header.version is None:
             self.fdt.header.version = self.fdt.header.MAX_VERSION
         return self.fdt.to_dtb()
 
     def unpack(self, raw):
         super().unpack(raw)
-        self.fdt = parse_dtb(raw)
+        self._fdt = None
+        self._raw = bytes(raw)
         return self
 
 
@@ -1,35 +1,100 @@
 """File tests"""
 
-from contextlib import nullcontext
-from io import IOBase
+from contextlib import suppress
+from copy import deepcopy
+from hashlib import blake2b
+from io import BytesIO, IOBase
+from itertools import count
+from operator import attrgetter
 from pathlib import Path
-import sys
-from tempfile import NamedTemporaryFile, TemporaryFile
+from tempfile import TemporaryDirectory, TemporaryFile
 import unittest
 from uuid import UUID
 from pihat.eeprom import (EepromFile, EepromGpioDrive, EepromGpioFunction,
                           EepromGpioSlew, EepromGpioHysteresis,
                           EepromGpioBackPower, EepromGpioPull)
 
+FILES_DIR = Path(__file__).parent / 'files'
+
+SAMPLE_UUID = UUID('23872014-7f74-46f9-b521-02456d9c8261')
+NEW_UUID = UUID('5faf992a-2098-496c-a119-46dcb2dc0ddd')
+
+SAMPLE_FIELDS = attrgetter('uuid', 'pid', 'pver', 'vstr', 'pstr')
+SAMPLE_EXPECTED = (SAMPLE_UUID, 0xcafe, 0x0007, b'The Factory',
+                   b'Sample Board')
+
 
 class FileTestBase(unittest.TestCase):
-    """File tests base class"""
+    """File tests base class
+
+    The shared fixtures (golden blobs, digests, and decoded EEPROMs)
+    are read-only after `setUpClass`, and temporary files are given
+    unique names within a per-class directory, so tests may safely be
+    run in parallel (e.g. via `pytest -n auto`).
+    """
+
+    tmp_counter = count()
 
     @classmethod
     def setUpClass(cls):
         """Initialise test suite"""
-        module = sys.modules[cls.__module__]
-        cls.files = Path(module.__file__).parent / 'files'
+        cls.files = FILES_DIR
+        cls.blobs = {name: (cls.files / name).read_bytes()
+                     for name in ('sample.eep', 'spidev.eep')}
+        cls.digests = {name: blake2b(blob, digest_size=16).digest()
+                       for name, blob in cls.blobs.items()}
+        cls.sample = EepromFile(cls.blobs['sample.eep']).load()
+        cls.spidev = EepromFile(cls.blobs['spidev.eep']).load()
+        # pylint: disable=consider-using-with
+        cls.tmpdir = TemporaryDirectory(
+            dir='/dev/shm' if Path('/dev/shm').is_dir() else None
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """Finalise test suite"""
+        cls.tmpdir.cleanup()
+
+    def tmp_path(self):
+        """Construct a unique temporary file path"""
+        path = Path(self.tmpdir.name) / ('e%d.eep' % next(self.tmp_counter))
+        self.addCleanup(self.tmp_unlink, path)
+        return path
+
+    @staticmethod
+    def tmp_unlink(path):
+        """Remove a temporary file, if it exists"""
+        with suppress(FileNotFoundError):
+            path.unlink()
+
+    def blob_fh(self, name):
+        """Construct filehandle for cached golden file content"""
+        return BytesIO(self.blobs[name])
+
+    def file_bytes(self, file):
+        """Get complete content of a file, filehandle, or golden file"""
+        if isinstance(file, BytesIO):
+            return file.getvalue()
+        if isinstance(file, IOBase):
+            file.seek(0)
+            return file.read()
+        name = Path(file).name
+        if name in self.blobs:
+            return self.blobs[name]
+        return Path(file).read_bytes()
+
+    def file_digest(self, file):
+        """Get content digest of a file, filehandle, or golden file"""
+        if not isinstance(file, IOBase):
+            digest = self.digests.get(Path(file).name)
+            if digest is not None:
+                return digest
+        return blake2b(self.file_bytes(file), digest_size=16).digest()
 
     def assertFilesEqual(self, file1, file2):
         """Assert that files have identical content"""
-        def filecontext(file):
-            if isinstance(file, IOBase):
-                file.seek(0)
-                return nullcontext(file)
-            return open(file, 'rb')
-        with filecontext(file1) as fh1, filecontext(file2) as fh2:
-            self.assertEqual(fh1.read(), fh2.read())
+        if self.file_digest(file1) != self.file_digest(file2):
+            self.assertEqual(self.file_bytes(file1), self.file_bytes(file2))
 
 
 class FileTest(FileTestBase):
@@ -38,12 +103,7 @@ class FileTest(FileTestBase):
     def test_load(self):
         """Test loading EEPROM generated by eepmake"""
         eeprom = EepromFile(self.files / 'sample.eep').load()
-        self.assertEqual(eeprom.uuid,
-                         UUID('23872014-7f74-46f9-b521-02456d9c8261'))
-        self.assertEqual(eeprom.pid, 0xcafe)
-        self.assertEqual(eeprom.pver, 0x0007)
-        self.assertEqual(eeprom.vstr, b'The Factory')
-        self.assertEqual(eeprom.pstr, b'Sample Board')
+        self.assertEqual(SAMPLE_FIELDS(eeprom), SAMPLE_EXPECTED)
         self.assertEqual(eeprom.bank.drive, EepromGpioDrive.MA_14)
         self.assertEqual(eeprom.bank.slew, EepromGpioSlew.LIMITED)
         self.assertEqual(eeprom.bank.hysteresis, EepromGpioHysteresis.DEFAULT)
@@ -63,70 +123,85 @@ class FileTest(FileTestBase):
             '/fragment@0:target:0',
         )
 
-    def test_load_init_name(self):
-        """Test loading EEPROM from constructor filename"""
-        eeprom = EepromFile(self.files / 'spidev.eep').load()
-        self.assertEqual(eeprom.pid, 0xfeed)
-        self.assertFalse(eeprom.pins[7].used)
-
-    def test_load_explicit_name(self):
-        """Test loading EEPROM from explicit filename"""
-        eeprom = EepromFile().load(self.files / 'sample.eep')
-        self.assertEqual(eeprom.pver, 0x0007)
-        self.assertTrue(eeprom.pins[3].used)
-        self.assertFalse(eeprom.pins[4].used)
-
-    def test_load_init_fh(self):
-        """Test loading EEPROM from constructor filehandle"""
-        with open(self.files / 'sample.eep', 'rb') as fh:
-            eeprom = EepromFile(fh).load()
-            self.assertFalse(fh.closed)
-            self.assertEqual(eeprom.pver, 0x0007)
-            self.assertEqual(eeprom.pstr, b'Sample Board')
-
-    def test_load_explicit_fh(self):
-        """Test loading EEPROM from explicit filehandle"""
-        with open(self.files / 'spidev.eep', 'rb') as fh:
-            eeprom = EepromFile().load(fh)
-            self.assertFalse(fh.closed)
-            self.assertEqual(eeprom.pstr, b'SPI Thing')
-            self.assertEqual(eeprom.pins[10].function, EepromGpioFunction.ALT0)
-
-    def test_save_init_name(self):
-        """Test saving EEPROM to constructor filename"""
-        with NamedTemporaryFile() as temp:
-            eeprom = EepromFile(temp.name)
-            eeprom.load(self.files / 'spidev.eep')
-            eeprom.save()
-            self.assertFilesEqual(temp.name, self.files / 'spidev.eep')
-
-    def test_save_explicit_name(self):
-        """Test saving EEPROM to explicit filename"""
-        eeprom = EepromFile(self.files / 'sample.eep').load()
-        with NamedTemporaryFile() as temp:
-            eeprom.save(temp.name, verify=True)
-            self.assertFilesEqual(temp.file, self.files / 'sample.eep')
+    LOAD_CASES = [
+        ('init', 'name', 'spidev.eep'),
+        ('init', 'fh', 'sample.eep'),
+        ('init', 'bytes', 'sample.eep'),
+        ('explicit', 'name', 'sample.eep'),
+        ('explicit', 'fh', 'spidev.eep'),
+        ('explicit', 'bytes', 'spidev.eep'),
+    ]
 
-    def test_save_init_fh(self):
-        """Test saving EEPROM to constructor filehandle"""
-        with TemporaryFile() as temp:
-            eeprom = EepromFile(temp)
-            eeprom.load(self.files / 'spidev.eep')
-            eeprom.save()
-            self.assertFalse(temp.closed)
-            self.assertFilesEqual(temp, self.files / 'spidev.eep')
+    SAVE_CASES = [
+        ('init', 'name', 'spidev.eep'),
+        ('init', 'fh', 'spidev.eep'),
+        ('explicit', 'name', 'sample.eep'),
+        ('explicit', 'fh', 'spidev.eep'),
+    ]
 
-    def test_save_explicit_fh(self):
-        """Test saving EEPROM to explicit filehandle"""
-        eeprom = EepromFile(self.files / 'spidev.eep').load()
-        with TemporaryFile() as temp:
-            eeprom.save(temp)
-            self.assertFalse(temp.closed)
-            self.assertFilesEqual(temp, self.files / 'spidev.eep')
+    def golden(self, name):
+        """Get shared decoded fixture for a golden file"""
+        return self.sample if name == 'sample.eep' else self.spidev
+
+    def load_source(self, src, name):
+        """Construct a load source for a golden file"""
+        if src == 'name':
+            return self.files / name
+        if src == 'bytes':
+            return self.blobs[name]
+        return self.blob_fh(name)
+
+    def save_target(self, dst):
+        """Construct a temporary save target"""
+        if dst == 'fh':
+            temp = TemporaryFile()
+            self.addCleanup(temp.close)
+            return temp
+        return self.tmp_path()
+
+    def test_load_variants(self):
+        """Test loading EEPROM from constructor and explicit sources"""
+        for ctor, src, name in self.LOAD_CASES:
+            with self.subTest(ctor=ctor, src=src, name=name):
+                source = self.load_source(src, name)
+                if ctor == 'init':
+                    eeprom = EepromFile(source).load()
+                else:
+                    eeprom = EepromFile().load(source)
+                if src == 'fh':
+                    self.assertFalse(source.closed)
+                self.assertEqual(eeprom, self.golden(name))
+
+    def test_save_variants(self):
+        """Test saving EEPROM to constructor and explicit targets"""
+        for ctor, dst, name in self.SAVE_CASES:
+            with self.subTest(ctor=ctor, dst=dst, name=name):
+                if ctor == 'init':
+                    temp = self.save_target(dst)
+                    eeprom = EepromFile(temp)
+                    eeprom.load(self.files / name)
+                    eeprom.save(verify=dst == 'name')
+                    if dst == 'fh':
+                        self.assertFalse(temp.closed)
+                    self.assertFilesEqual(temp, self.files / name)
+                elif dst == 'name':
+                    temp = self.tmp_path()
+                    eeprom = deepcopy(self.golden(name))
+                    data = eeprom.save(temp)
+                    self.assertEqual(
+                        blake2b(data, digest_size=16).digest(),
+                        self.digests[name]
+                    )
+                else:
+                    buf = BytesIO()
+                    eeprom = deepcopy(self.golden(name))
+                    eeprom.save(buf)
+                    self.assertFalse(buf.closed)
+                    self.assertEqual(buf.getvalue(), self.blobs[name])
 
     def test_open(self):
         """Test opening EEPROM file"""
-        with TemporaryFile() as temp:
+        with BytesIO() as temp:
             eeprom = EepromFile(temp)
             with eeprom.open() as fh:
                 self.assertEqual(fh, temp)
@@ -134,15 +209,14 @@ class FileTest(FileTestBase):
     def test_context(self):
         """Test using EEPROM as context manager"""
         with EepromFile(self.files / 'sample.eep') as eeprom:
-            self.assertEqual(eeprom.uuid,
-                             UUID('23872014-7f74-46f9-b521-02456d9c8261'))
-            with TemporaryFile() as temp:
-                eeprom.save(temp)
-                self.assertFilesEqual(temp, self.files / 'sample.eep')
+            self.assertEqual(eeprom.uuid, SAMPLE_UUID)
+            buf = BytesIO()
+            eeprom.save(buf)
+            self.assertEqual(buf.getvalue(), self.blobs['sample.eep'])
 
     def test_no_autoload(self):
         """Test disabling autoload"""
-        with TemporaryFile() as temp:
+        with BytesIO() as temp:
             with EepromFile(temp, autoload=False) as eeprom:
                 self.assertEqual(eeprom.vstr, b'')
                 eeprom.load(self.files / 'spidev.eep')
@@ -152,43 +226,33 @@ class FileTest(FileTestBase):
 
     def test_autosave(self):
         """Test automatic saving of modified EEPROM"""
-        with NamedTemporaryFile() as temp:
-            with open(self.files / 'sample.eep', 'rb') as original:
-                temp.write(original.read())
-                temp.flush()
-            with EepromFile(temp.name, autosave=True) as eeprom1:
-                self.assertEqual(eeprom1.uuid,
-                                 UUID('23872014-7f74-46f9-b521-02456d9c8261'))
-                self.assertEqual(eeprom1.pstr, b'Sample Board')
-                eeprom1.uuid = UUID('5faf992a-2098-496c-a119-46dcb2dc0ddd')
-            with EepromFile(temp.name, autosave=False) as eeprom2:
-                self.assertEqual(eeprom2.uuid,
-                                 UUID('5faf992a-2098-496c-a119-46dcb2dc0ddd'))
-                self.assertEqual(eeprom2.pstr, b'Sample Board')
-                eeprom2.pstr = b'Nothing'
-            with EepromFile(temp.name, autosave=False) as eeprom3:
-                self.assertEqual(eeprom3.uuid,
-                                 UUID('5faf992a-2098-496c-a119-46dcb2dc0ddd'))
-                self.assertEqual(eeprom3.pstr, b'Sample Board')
-                eeprom3.pstr = b'Something'
-                eeprom3.save()
-                eeprom3.pstr = b'Else'
-                eeprom3.save()
-            with EepromFile(temp.name, autosave=False) as eeprom4:
-                self.assertEqual(eeprom4.uuid,
-                                 UUID('5faf992a-2098-496c-a119-46dcb2dc0ddd'))
-                self.assertEqual(eeprom4.pstr, b'Else')
+        temp = self.tmp_path()
+        temp.write_bytes(self.blobs['sample.eep'])
+        with EepromFile(temp, autosave=True) as eeprom1:
+            self.assertEqual(eeprom1.uuid, SAMPLE_UUID)
+            self.assertEqual(eeprom1.pstr, b'Sample Board')
+            eeprom1.uuid = NEW_UUID
+        with EepromFile(temp, autosave=False) as eeprom2:
+            self.assertEqual(eeprom2.uuid, NEW_UUID)
+            self.assertEqual(eeprom2.pstr, b'Sample Board')
+            eeprom2.pstr = b'Something'
+            eeprom2.save()
+            eeprom2.pstr = b'Else'
+            eeprom2.save()
+            eeprom2.pstr = b'Nothing'
+        with EepromFile(temp, autosave=False) as eeprom3:
+            self.assertEqual(eeprom3.uuid, NEW_UUID)
+            self.assertEqual(eeprom3.pstr, b'Else')
 
     def test_autouuid(self):
         """Test automatic generation of UUID"""
-        with NamedTemporaryFile() as temp:
-            eeprom1 = EepromFile(temp.name, autouuid=True)
-            eeprom1.vstr = b'Hello'
-            eeprom1.vstr = b'World'
-            self.assertEqual(eeprom1.uuid.int, 0)
-            eeprom1.save(temp.name)
-            self.assertEqual(eeprom1.uuid.int, 0)
-            eeprom2 = EepromFile(temp.name).load()
-            self.assertNotEqual(eeprom2.uuid.int, 0)
-            eeprom1.uuid = eeprom2.uuid
-            self.assertEqual(eeprom1, eeprom2)
+        eeprom1 = EepromFile(autouuid=True)
+        eeprom1.vstr = b'Hello'
+        eeprom1.vstr = b'World'
+        self.assertEqual(eeprom1.uuid.int, 0)
+        data = eeprom1.save(BytesIO())
+        self.assertEqual(eeprom1.uuid.int, 0)
+        eeprom2 = EepromFile(data).load()
+        self.assertNotEqual(eeprom2.uuid.int, 0)
+        eeprom1.uuid = eeprom2.uuid
+        self.assertEqual(eeprom1, eeprom2)